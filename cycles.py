@@ -15,15 +15,46 @@ This file: `cycles` for visualising tonality, meter, and more on circles.
 
 __author__ = "Mark Gotham"
 
-import math
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import combinations
 from typing import Optional
-from utils import pitch_name_list
+from utils import pitch_name_list, write_tex
 
 
 # -----------------------------------------------------------------------------
 
 # Set up
 
+@lru_cache
+def node_geometry(n: int) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """
+    The positions of `n` equally spaced nodes on a circle,
+    with 0 at the top (90 degrees) and proceeding clockwise.
+    This depends only on `n`, so is computed once per cycle length and cached.
+
+    :param n: The number of elements (equally spaced) in the circle.
+
+    :return: a tuple of the angles (already formatted, as this float-to-string step is the costly part of each node string)
+        and the corresponding label positions (above, right, below, left).
+    """
+    # Rounded: TeX needs nowhere near the 17 significant figures of a float repr.
+    angles = tuple(str(round((360 + 90 - (i * 360 / n)) % 360, 4)) for i in range(n))
+
+    label_positions = []
+    for i in range(n):  # Compare 2i with n (i.e., i/n with 1/2) in integers.
+        if i == 0:
+            label_positions.append("above")
+        elif 2 * i < n:
+            label_positions.append("right")
+        elif 2 * i == n:
+            label_positions.append("below")
+        else:
+            label_positions.append("left")
+
+    return angles, tuple(label_positions)
+
+
 def node_strings(
         ks: list[int],
         n: int,
@@ -45,6 +76,33 @@ def node_strings(
 
     :return: a list of strings
     """
+    return list(_node_strings(
+        tuple(ks),
+        n,
+        label_angles=label_angles,
+        denominator_in_label=denominator_in_label,
+        tonality_not_count=tonality_not_count,
+        radius_string=radius_string,
+    ))
+
+
+@lru_cache(maxsize=128)
+def _node_strings(
+        ks: tuple[int, ...],
+        n: int,
+        label_angles: bool = True,
+        denominator_in_label: bool = False,
+        tonality_not_count: bool = False,
+        radius_string: str = "\\radius",
+) -> tuple[str, ...]:
+    """
+    Cached body of `node_strings` (see the parameters there),
+    as the same circle often recurs (e.g., across a set of figures).
+
+    :param ks: The indices of elements in the circle to highlight, as a tuple (hashable, for the cache).
+
+    :return: a tuple of strings
+    """
 
     strings = []
 
@@ -54,38 +112,35 @@ def node_strings(
                 f"To use the pitch class labels, the cycle length (currently {n}) must be 12."
             )
 
+    ks_set = set(ks)  # Constant-time membership test per node
+
+    angles, label_positions = node_geometry(n)
+    if label_angles:
+        label_positions = angles
+
+    # Choose the label type once, rather than per node
+    if tonality_not_count:  # NB n=12 check is above
+        labels = pitch_name_list
+    elif denominator_in_label:
+        labels = [f"{i}/{n}" for i in range(n)]
+    else:
+        labels = range(n)
+
     for i in range(n):
 
-        angle = (360 + 90 - ((i / n) * 360)) % 360
+        angle = angles[i]
 
-        colour = "black" if (i in ks) else "white"
+        colour = "black" if (i in ks_set) else "white"
 
-        if label_angles:
-            label_position = angle
-        else:
-            if i / n == 0:
-                label_position = "above"
-            elif i / n < 0.5:
-                label_position = "right"
-            elif i / n == 0.5:
-                label_position = "below"
-            elif i / n > 0.5:
-                label_position = "left"
-
-        if tonality_not_count:  # NB n=12 check is above
-            label = pitch_name_list[i]
-        else:
-            if denominator_in_label:
-                label = f"{i}/{n}"
-            else:
-                label = i
+        label_position = label_positions[i]
+
+        label = labels[i]
 
-        t = f"\\node (n{i}) at +({angle}:{radius_string}) [circle, draw, fill={colour}, label = {label_position}:{label}]"
         strings.append(
-            t + "{};\n"
+            f"\\node (n{i}) at +({angle}:{radius_string}) [circle, draw, fill={colour}, label = {label_position}:{label}]{{}};\n"
         )
 
-    return strings
+    return tuple(strings)
 
 
 def single_cycle_example(
@@ -117,48 +172,72 @@ def single_cycle_example(
     """
     if ks is None:
         ks = range(n)
-    else:
-        for k in ks:
-            if k not in range(n):
-                raise ValueError(f"Highlighted index {k} is greater than the total n ({n}).")
+    elif ks and (min(ks) < 0 or max(ks) >= n):
+        raise ValueError(f"Highlighted indices ({ks}) must be in the range 0 to {n - 1}.")
+
+    tex = single_cycle_tex(
+        ks,
+        n,
+        radius=radius,
+        lines=lines,
+        adjacent_not_all=adjacent_not_all,
+        tonality_not_count=tonality_not_count,
+        include_preamble=include_preamble,
+    )
+    write_tex(file_name, tex)
 
-    with open(f"./output/{file_name}.tex", "w") as f:
 
-        if include_preamble:
-            f.write("\\documentclass[tikz,border=10pt]{standalone}\n")
-            f.write("\\usepackage{tikz}\n")
-            f.write("\\usetikzlibrary{shapes.misc, arrows.meta, bending}\n")
-            f.write("\\begin{document}\n")
+def single_cycle_tex(
+        ks: list[int],
+        n: int,
+        radius: float = 1.,
+        lines: bool = True,
+        adjacent_not_all: bool = True,
+        tonality_not_count: bool = False,
+        include_preamble: bool = False,
+) -> str:
+    """
+    Assemble the TeX for one k-in-n cycle, as written by `single_cycle_example` (see the parameters there).
 
-        scale = int(math.log2(n) - 1)  # E.g., 2 for n=8, 3 for n = 16
+    :return: the TeX as a single string.
+    """
+    parts = []
+
+    if include_preamble:
+        parts.append(
+            "\\documentclass[tikz,border=10pt]{standalone}\n"
+            "\\usepackage{tikz}\n"
+            "\\usetikzlibrary{shapes.misc, arrows.meta, bending}\n"
+            "\\begin{document}\n"
+        )
+
+    scale = max(1, n.bit_length() - 2)  # I.e., floor(log2(n)) - 1, at least 1. E.g., 2 for n=8, 3 for n = 16
 
-        f.write("\\begin{tikzpicture}[scale={" + str(scale) + "}]\n")
+    parts.append("\\begin{tikzpicture}[scale={" + str(scale) + "}]\n")
 
-        # Circle
-        f.write("\def \\radius{" + str(radius) + "}\n")
-        f.write("\\node (origin) at (0,0) {};\n")
-        f.write("\draw (origin) circle (\\radius);\n")
+    # Circle
+    parts.append("\def \\radius{" + str(radius) + "}\n")
+    parts.append(
+        "\\node (origin) at (0,0) {};\n"
+        "\draw (origin) circle (\\radius);\n"
+    )
+
+    parts.extend(_node_strings(tuple(ks), n, tonality_not_count=tonality_not_count))  # default radius_string
 
-        nodes = node_strings(ks, n, tonality_not_count=tonality_not_count) # default radius_string
-        for n in nodes:
-            f.write(n)
+    if lines:
+        if adjacent_not_all:
+            parts.extend(f"\draw[solid] (n{a}) -- (n{b});\n" for a, b in zip(ks, ks[1:]))
+            # Last one:
+            parts.append(f"\draw[solid] (n{ks[-1]}) -- (n0);\n")
+        else:
+            parts.extend(f"\draw[solid] (n{a}) -- (n{b});\n" for a, b in combinations(ks, 2))
 
-        if lines:
-            if adjacent_not_all:
-                for i in range(len(ks) - 1):
-                    f.write(f"\draw[solid] (n{ks[i]}) -- (n{ks[i + 1]});\n")
-                # Last one:
-                f.write(f"\draw[solid] (n{ks[-1]}) -- (n0);\n")
-            else:
-                from itertools import combinations
-                c = combinations(ks, 2)
-                for pair in c:
-                    f.write(f"\draw[solid] (n{pair[0]}) -- (n{pair[1]});\n")
+    parts.append("\\end{tikzpicture}\n")
 
-        f.write("\\end{tikzpicture}\n")
+    if include_preamble:
+        parts.append("\\end{document}\n")
 
-        if include_preamble:
-            f.write("\\end{document}\n")
+    return "".join(parts)
 
 
 def two_circles(
@@ -189,48 +268,44 @@ def two_circles(
     # Checks
     if inner_k is None:
         inner_k = range(inner_n)
-    else:
-        for k in inner_k:
-            if k not in range(inner_n):
-                raise ValueError(f"Highlighted index {k} is greater than the total n ({inner_n}).")
+    elif inner_k and (min(inner_k) < 0 or max(inner_k) >= inner_n):
+        raise ValueError(f"Highlighted indices ({inner_k}) must be in the range 0 to {inner_n - 1}.")
 
     if outer_k is None:
         outer_k = range(outer_n)
-    else:
-        for k in outer_k:
-            if k not in range(outer_n):
-                raise ValueError(f"Highlighted index {k} is greater than the total n ({outer_n}).")
-
-    with open(f"./output/{file_name}.tex", "w") as f:
+    elif outer_k and (min(outer_k) < 0 or max(outer_k) >= outer_n):
+        raise ValueError(f"Highlighted indices ({outer_k}) must be in the range 0 to {outer_n - 1}.")
 
-        if include_preamble:
-            f.write("\\documentclass[tikz,border=10pt]{standalone}\n")
-            f.write("\\usepackage{tikz}\n")
-            f.write("\\usetikzlibrary{shapes.misc, arrows.meta, bending}\n")
-            f.write("\\begin{document}\n")
+    parts = []
 
-        f.write("\\begin{tikzpicture}[scale=2]\n")
+    if include_preamble:
+        parts.append(
+            "\\documentclass[tikz,border=10pt]{standalone}\n"
+            "\\usepackage{tikz}\n"
+            "\\usetikzlibrary{shapes.misc, arrows.meta, bending}\n"
+            "\\begin{document}\n"
+        )
 
-        # Inner Circle
-        f.write("\def \\innerradius{" + str(inner_radius) + "}\n")
-        f.write("\\node (origin) at (0,0) {};\n")
-        f.write("\draw (origin) circle (\\innerradius);\n")
-        nodes = node_strings(inner_k, inner_n, radius_string="\\innerradius")
-        for n in nodes:
-            f.write(n)
+    parts.append("\\begin{tikzpicture}[scale=2]\n")
+
+    # Inner then outer circle
+    for ks, n, radius, radius_string in (
+            (inner_k, inner_n, inner_radius, "\\innerradius"),
+            (outer_k, outer_n, outer_radius, "\\outerradius"),
+    ):
+        parts.append("\def " + radius_string + "{" + str(radius) + "}\n")
+        parts.append(
+            "\\node (origin) at (0,0) {};\n"
+            "\draw (origin) circle (" + radius_string + ");\n"
+        )
+        parts.extend(_node_strings(tuple(ks), n, radius_string=radius_string))
 
-        # Outer Circle
-        f.write("\def \\outerradius{" + str(outer_radius) + "}\n")
-        f.write("\\node (origin) at (0,0) {};\n")
-        f.write("\draw (origin) circle (\\outerradius);\n")
-        nodes = node_strings(outer_k, outer_n, radius_string="\\outerradius")
-        for n in nodes:
-            f.write(n)
+    parts.append("\\end{tikzpicture}\n")
 
-        f.write("\\end{tikzpicture}\n")
+    if include_preamble:
+        parts.append("\\end{document}\n")
 
-        if include_preamble:
-            f.write("\\end{document}\n")
+    write_tex(file_name, "".join(parts))
 
 
 # -----------------------------------------------------------------------------
@@ -281,7 +356,11 @@ def two_circles_3_in_8() -> None:
 
 
 if __name__ == "__main__":
-    tresillo_example()
-    double_tresillo_all_intervals()
-    tonality_example()
-    two_circles_3_in_8()
+    # Independent files, so build in parallel.
+    with ProcessPoolExecutor() as executor:
+        futures = [
+            executor.submit(example)
+            for example in (tresillo_example, double_tresillo_all_intervals, tonality_example, two_circles_3_in_8)
+        ]
+        for future in futures:
+            future.result()  # Re-raise any error from the worker
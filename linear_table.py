@@ -15,7 +15,7 @@ This file: `linear_table` for MIDI <> pitch-class comparison and grid-tatum demo
 
 __author__ = "Mark Gotham"
 
-from utils import pitch_name_list
+from utils import pitch_class_row, pitch_name_row, write_tex
 
 
 # -----------------------------------------------------------------------------
@@ -42,37 +42,39 @@ def midi_pitch_pc_table(
         d = ["\\dots"]  # For the ends
     else:
         d = [""]
-    midis = " & ".join(d + [str(x) for x in ints] + d)
+    midis = " & ".join(d + list(map(str, ints)) + d)
     octaves = end_octave - start_octave
-    pcs = " & ".join(d + [str(x) for x in list(range(12)) * octaves] + d)
-    names = " & ".join(d + (pitch_name_list * octaves) + d)
+    # Repeat the pre-joined octave rows (the outer join re-inserts the " & " between octaves).
+    pcs = " & ".join(d + [pitch_class_row] * octaves + d)
+    names = " & ".join(d + [pitch_name_row] * octaves + d)
     ccs = "c" + ("|cccccccccccc" * octaves) + "|c"  # TODO consider p{4pt}
 
-    with open(f"./output/{file_name}.tex", "w") as f:
+    parts = []
 
-        if include_preamble:
-            f.write("\\documentclass{standalone}\n")
-            f.write("\\begin{document}\n")
-            f.write("\\begin{table}[h!]\n")
-            f.write("\\centering\n")
-            f.write("\\caption{MIDI Pitch to Pitch Class Mapping}\n")
+    if include_preamble:
+        parts.append(
+            "\\documentclass{standalone}\n"
+            "\\begin{document}\n"
+            "\\begin{table}[h!]\n"
+            "\\centering\n"
+            "\\caption{MIDI Pitch to Pitch Class Mapping}\n"
+        )
 
-        f.write("\\begin{tabular}{" + ccs + "}\n")
+    parts.append("\\begin{tabular}{" + ccs + "}\n")
 
-        if not open_ended:
-            f.write("\\textbf{MIDI} ")
-        f.write(midis + "\n")
-        f.write("\\\\\n")
+    if not open_ended:
+        parts.append("\\textbf{MIDI} ")
+    parts.append(midis + "\n\\\\\n")
 
-        if not open_ended:
-            f.write("\\textbf{Name} ")
-        f.write(names + "\n")
-        f.write("\\\\\n")
+    if not open_ended:
+        parts.append("\\textbf{Name} ")
+    parts.append(names + "\n\\\\\n")
 
-        if not open_ended:
-            f.write("\\textbf{Class} ")
-        f.write(pcs + "\n")
-        f.write("\\end{tabular}\n")
+    if not open_ended:
+        parts.append("\\textbf{Class} ")
+    parts.append(pcs + "\n\\end{tabular}\n")
+
+    write_tex(file_name, "".join(parts))
 
 
 def grid_tatum(
@@ -90,28 +92,34 @@ def grid_tatum(
     :param include_preamble: Start `documentclass{standalone}` or `begin{tabular}`.
     :return:
     """
-    with open(f"./output/{file_name}.tex", "w") as f:
+    parts = []
 
-        if include_preamble:
-            f.write("\\documentclass{standalone}\n")
-            f.write("\\begin{document}\n")
-            f.write("\\begin{table}[h!]\n")
-            f.write("\\centering\n")
+    if include_preamble:
+        parts.append(
+            "\\documentclass{standalone}\n"
+            "\\begin{document}\n"
+            "\\begin{table}[h!]\n"
+            "\\centering\n"
+        )
 
-        f.write("\\begin{tikzpicture}[scale=1, transform shape]\n")
+    parts.append("\\begin{tikzpicture}[scale=1, transform shape]\n")
 
-        for n in range(n_divs):
+    for n in range(n_divs):
+        if n > 0:  # Nothing to divide in the 0th row (and no division by 0).
+            edges = [length_unit * i / n for i in range(n + 1)]  # Each shared by adjacent rectangles
             for i in range(n):
-                f.write(f"\\filldraw[fill=blue!20, draw=black]")
-                f.write(f"({length_unit * i / n}, {n})")  # Bottom left
-                f.write(f"rectangle ({(i + 1) * length_unit / n}, {n + 1})")  # Top right
-                f.write("node[midway] {1/")
-                f.write(str(n))  # Label in format 1/<n>.
-                f.write("};\n")
+                parts.append(
+                    f"\\filldraw[fill=blue!20, draw=black]"
+                    f"({edges[i]}, {n})"  # Bottom left
+                    f"rectangle ({edges[i + 1]}, {n + 1})"  # Top right
+                    f"node[midway] {{1/{n}}};\n"  # Label in format 1/<n>.
+                )
+
+        parts.append("\\\\\n")
 
-            f.write("\\\\\n")
+    parts.append("\\end{tikzpicture}\n")
 
-        f.write("\\end{tikzpicture}\n")
+    write_tex(file_name, "".join(parts))
 
 
 # -----------------------------------------------------------------------------
@@ -15,6 +15,8 @@ This file: `schema` diagrams
 
 __author__ = "Mark Gotham"
 
+from utils import write_tex
+
 
 def schema_example(
         root_name: str,
@@ -43,41 +45,57 @@ def schema_example(
     if tags != sorted(tags):
         raise ValueError("Tags must be in increasing order")
 
-    with open(f"./output/{file_name}.tex", "w") as f:
+    write_tex(file_name, schema_tex(root_name, circles, include_preamble=include_preamble))
+
+
+def schema_tex(
+        root_name: str,
+        circles: list[dict],
+        include_preamble: bool = False,
+) -> str:
+    """
+    Assemble the schema figure, as written by `schema_example` (see the parameters there).
+
+    :return: the TeX as a single string.
+    """
+    parts = []
+
+    if include_preamble:
+        parts.append(
+            "\\documentclass[tikz,border=10pt]{standalone}\n"
+            "\\usepackage{tikz}\n"
+            "\\usetikzlibrary{shapes.misc, arrows.meta, bending}\n"
+            "\\begin{document}\n"
+        )
 
-        if include_preamble:
-            f.write("\\documentclass[tikz,border=10pt]{standalone}\n")
-            f.write("\\usepackage{tikz}\n")
-            f.write("\\usetikzlibrary{shapes.misc, arrows.meta, bending}\n")
-            f.write("\\begin{document}\n")
+    parts.append("\\begin{tikzpicture}\n")
 
-        f.write("\\begin{tikzpicture}\n")
+    # Root circle:
+    root_string = "{" + root_name + "}"  # Verbose to avoid confusion with f-strings and {} characters
+    parts.append(f"    \\node (bottom) at (0,0) [circle, fill=black, text=white, minimum width=1.5em] {root_string};\n")
 
-        # Root circle:
-        root_string = "{" + root_name + "}"  # Verbose to avoid confusion with f-strings and {} characters
-        f.write(f"    \\node (bottom) at (0,0) [circle, fill=black, text=white, minimum width=1.5em] {root_string};\n")
+    # Circles above:
+    for i, circle in enumerate(circles):
+        parts.append(
+            f"    \\node (top{i + 1}) at (0, {i + 1}) [circle, draw=black, thick, minimum width=1.5em] {{{circle['name']}}};\n")
 
-        # Circles above:
-        for i, circle in enumerate(circles):
-            f.write(
-                f"    \\node (top{i + 1}) at (0, {i + 1}) [circle, draw=black, thick, minimum width=1.5em] {{{circle['name']}}};\n")
+    # Rounded rectangle around all circles (the top one is at len(circles), rather than relying on the loop's last i):
+    parts.append(f"    \\draw[rounded corners=5pt, dashed] (-0.5, -0.5) rectangle (0.5, {len(circles) + 0.5});\n")
 
-        # Rounded rectangle around all circles (with the last i defined above:
-        f.write(f"    \\draw[rounded corners=5pt, dashed] (-0.5, -0.5) rectangle (0.5, {i + 1.5});\n")
+    # Draw curved arrows with annotations:
+    parts.append("    % Draw curved arrows with annotations\n")
+    directions = ("left", "right")  # Alternating, with the bend increasing by 20 each time
+    parts.extend(
+        f"    \\draw[->, bend {directions[i % 2]}={20 * i}] (bottom) to node[midway, {directions[i % 2]}] {{{circle['tag']}}} (top{i + 1});\n"
+        for i, circle in enumerate(circles)
+    )
 
-        # Draw curved arrows with annotations:
-        f.write("    % Draw curved arrows with annotations\n")
-        bend_angle = 0
-        for i, circle in enumerate(circles):
-            direction = "left" if i % 2 == 0 else "right"
-            f.write(
-                f"    \\draw[->, bend {direction}={bend_angle}] (bottom) to node[midway, {direction}] {{{circle['tag']}}} (top{i + 1});\n")
-            bend_angle += 20
+    parts.append("\\end{tikzpicture}\n")
 
-        f.write("\\end{tikzpicture}\n")
+    if include_preamble:
+        parts.append("\\end{document}\n")
 
-        if include_preamble:
-            f.write("\\end{document}\n")
+    return "".join(parts)
 
 
 def example_use_case() -> None:
@@ -15,5 +15,28 @@ This file: Basic, shared `utils`
 
 __author__ = "Mark Gotham"
 
+from pathlib import Path
 
-pitch_name_list = ["C", "C$\sharp$", "D", "E$\\flat$", "E", "F", "F$\\sharp$", "G", "A$\\flat$", "A", "B$\\flat$", "B"]
\ No newline at end of file
+output_dir = Path("./output")
+
+pitch_name_list = ["C", "C$\sharp$", "D", "E$\\flat$", "E", "F", "F$\\sharp$", "G", "A$\\flat$", "A", "B$\\flat$", "B"]
+
+# Pre-joined table rows (one octave each) for the `linear_table` MIDI comparison.
+pitch_name_row = " & ".join(pitch_name_list)
+pitch_class_row = " & ".join(map(str, range(12)))
+
+
+def write_tex(
+        file_name: str,
+        tex: str,
+) -> None:
+    """
+    Write a figure to `./output/<file_name>.tex` in one call.
+    A single write of the whole string means the file's buffer size does not matter.
+
+    :param file_name: The directory `./output/` is hard-coded (and created if missing). Name here.
+    :param tex: The full TeX content.
+    """
+    output_dir.mkdir(exist_ok=True)
+    with open(output_dir / f"{file_name}.tex", "wb") as f:  # Bytes: skip the text layer's newline translation
+        f.write(tex.encode("utf-8"))